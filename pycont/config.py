@@ -47,7 +47,7 @@ _N_STEP_MODE = {
 }
 
 
-@dataclass(frozen=True, kw_only=True)
+@dataclass(frozen=True, kw_only=True, slots=True)
 class PumpConfig:
     """
     name: The name of the controller.
@@ -82,13 +82,13 @@ class PumpConfig:
         return pump_controller(pump_io, self)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class IOConfig:
     """See :meth:`PumpIO.from_config`"""
     io_type: str
     options: tuple[tuple[str, Any]]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BusConfig:
     io_config: IOConfig
     pumps: Collection[PumpConfig]
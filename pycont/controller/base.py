@@ -30,6 +30,9 @@ if TYPE_CHECKING:
 #: Specifies a time to wait
 WAIT_SLEEP_TIME = 0.1
 
+#: Initial time to wait between status polls, doubled after each poll that finds the pump still busy
+MIN_POLL_INTERVAL = 0.01
+
 #: Sets the maximum number of attempts to Write and Read
 MAX_REPEAT_WRITE_AND_READ = 10
 
@@ -37,6 +40,17 @@ MAX_REPEAT_WRITE_AND_READ = 10
 MAX_REPEAT_OPERATION = 10
 
 
+#: Valve configurations that can be inferred from the IOBEXYZ field of the EEPROM config
+_VALVE_CONFIG_MAP = {
+    # flash_eeprom_3_way_t_valve() AND flash_eeprom_3_way_y_valve(). Difference is jumper J2-5, check with ?28
+    "2013100" : "3-WAY",
+    # flash_eeprom_4_way_dist_valve()
+    "2033110" : "4-WAY dist",
+    # flash_eeprom_4_way_nondist_valve()
+    "2130001" : "4-WAY nondist",
+}
+
+
 class MaxRetriesExceededError(Exception):
     """
     Exception for when there has been too many repeat attempts.
@@ -89,10 +103,22 @@ class PumpController(ABC):
         # self._cmd_buffer: deque[DTCommand] = deque()
         self._protocol = PumpProtocol(self.address)
 
+        # packets for commands without operands never change, so forge them once up front
+        self._status_packet = self._protocol.forge_report_status_packet()
+        self._initialized_packet = self._protocol.forge_report_initialized_packet()
+        self._top_velocity_packet = self._protocol.forge_report_peak_velocity_packet()
+        self._plunger_position_packet = self._protocol.forge_report_plunger_position_packet()
+        self._valve_position_packet = self._protocol.forge_report_valve_position_packet()
+        self._eeprom_packet = self._protocol.forge_report_eeprom_packet()
+        self._terminate_packet = self._protocol.forge_terminate_packet()
+
         self.micro_step_mode = config.micro_step_mode
         self.total_volume = float(config.total_volume)  # in ml (float)
         self.default_top_velocity = config.top_velocity
 
+        #: raw EEPROM config and the valve config inferred from it, see get_current_valve_config()
+        self._cached_eeprom: Optional[tuple[str, str]] = None
+
     @property
     def name(self) -> str:
         return self.config.name
@@ -101,6 +127,10 @@ class PumpController(ABC):
     def address(self) -> Address:
         return self.config.address
 
+    @property
+    def pump_io(self) -> PumpIO:
+        return self._io
+
     @property
     @abstractmethod
     def max_top_velocity(self) -> int:
@@ -116,9 +146,21 @@ class PumpController(ABC):
     def valve_set_config(self) -> Mapping[ValveSet, int]:
         raise NotImplementedError
 
+    @property
+    def micro_step_mode(self) -> Microstep:
+        return self._micro_step_mode
+
+    @micro_step_mode.setter
+    def micro_step_mode(self, micro_step_mode: Microstep) -> None:
+        self._micro_step_mode = micro_step_mode
+        # these are fixed by the pump model and microstep mode, so cache them here instead of going
+        # through the abstract properties every time they are needed
+        self._number_of_steps = self.number_of_steps
+        self._max_top_velocity = self.max_top_velocity
+
     @property
     def steps_per_ml(self) -> int:
-        return int(self.number_of_steps / self.total_volume)
+        return int(self._number_of_steps / self.total_volume)
 
     ## Command Execution ##
 
@@ -154,13 +196,13 @@ class PumpController(ABC):
 
         """
         for i in range(max_repeat):
-            self._log.debug("Write and read {}/{}: {}".format(i + 1, max_repeat, packet))
+            self._log.debug("Write and read %d/%d: %s", i + 1, max_repeat, packet)
             try:
                 return self._io.send_packet_and_read_response(packet)
             except PumpIOTimeOutError:
                 self._log.debug("Timeout, trying again!")
             except DTStatusDecodeError as err:
-                self._log.debug(f"Decode error, trying again! {err}")
+                self._log.debug("Decode error, trying again! %s", err)
 
             time.sleep(0.2)
 
@@ -206,9 +248,31 @@ class PumpController(ABC):
             ValueError: Value returned from the pump is not valid.
 
         """
-        report_status_packet = self._protocol.forge_report_status_packet()
-        response = self._write_and_read_from_pump(report_status_packet)
+        response = self._write_and_read_from_pump(self._status_packet)
+        return self.check_idle_status(response)
+
+    def get_status_packet(self) -> DTInstructionPacket:
+        """
+        Gets the packet used to query the pump status. Allows the status of several pumps on the same bus
+        to be queried together, see check_idle_status().
+        """
+        return self._status_packet
+
+    def check_idle_status(self, response: DTStatus) -> bool:
+        """
+        Decodes the response to the packet from get_status_packet().
+
+        Returns:
+            True: The pump is idle.
 
+            False: The pump is not idle.
+
+        Raises:
+            ValueError: Value returned from the pump is not valid.
+
+            PumpHardwareError: The pump reported an error.
+
+        """
         status = PumpStatus.try_decode(response.status)
         if status is None:
             raise ValueError(f"The pump replied status {response.status!r}, could not decode")
@@ -218,7 +282,6 @@ class PumpController(ABC):
 
         return not status.busy
 
-
     def is_busy(self) -> bool:
         """
         Determines if the pump is busy.
@@ -236,13 +299,22 @@ class PumpController(ABC):
 
     def wait_until_idle(self, *, poll_interval: Optional[float] = None) -> None:
         """
-        Waits until the pump is not busy for WAIT_SLEEP_TIME, default set to 0.1
+        Waits until the pump is not busy.
+
+        The pump is polled quickly at first so that short moves are picked up promptly, backing off
+        to poll_interval for long moves so that the bus is not flooded with status queries.
+
+        Args:
+            poll_interval: The longest time to wait between status polls,
+                default set to the PumpIO's default_poll_interval.
         """
         if poll_interval is None:
             poll_interval = self._io.default_poll_interval
 
+        delay = min(MIN_POLL_INTERVAL, poll_interval)
         while self.is_busy():
-            time.sleep(poll_interval)
+            time.sleep(delay)
+            delay = min(delay * 2, poll_interval)
 
     def is_initialized(self) -> bool:
         """
@@ -254,8 +326,7 @@ class PumpController(ABC):
             False: The pump is not initialised.
 
         """
-        initialized_packet = self._protocol.forge_report_initialized_packet()
-        response = self._write_and_read_from_pump(initialized_packet)
+        response = self._write_and_read_from_pump(self._initialized_packet)
         return bool(int(response.data))
 
     def smart_initialize(self, valve_position: str = None, secure: bool = True) -> None:
@@ -403,7 +474,7 @@ class PumpController(ABC):
             ValueError: Top velocity is out of range.
 
         """
-        max_range = self.max_top_velocity
+        max_range = self._max_top_velocity
         if top_velocity in range(1, max_range + 1):
             return True
         else:
@@ -465,14 +536,14 @@ class PumpController(ABC):
             if self.get_top_velocity() == top_velocity:
                 return True
             else:
-                self._log.debug("Top velocity not set, change attempt {}/{}".format(i + 1, max_repeat))
+                self._log.debug("Top velocity not set, change attempt %d/%d", i + 1, max_repeat)
             self.check_top_velocity_within_range(top_velocity)
             self._write_and_read_from_pump(self._protocol.forge_top_velocity_packet(top_velocity))
             # if do not want to wait and check things went well, return now
             if secure is False:
                 return True
 
-        self._log.debug(f"[PUMP {self.name}] Too many failed attempts in set_top_velocity!")
+        self._log.debug("[PUMP %s] Too many failed attempts in set_top_velocity!", self.name)
         raise MaxRetriesExceededError(f'Repeated Error from pump {self.name}')
 
     def get_top_velocity(self) -> int:
@@ -483,8 +554,7 @@ class PumpController(ABC):
             top_velocity: The current top velocity (steps/second).
 
         """
-        top_velocity_packet = self._protocol.forge_report_peak_velocity_packet()
-        response = self._write_and_read_from_pump(top_velocity_packet)
+        response = self._write_and_read_from_pump(self._top_velocity_packet)
         return int(response.data)
 
     def get_plunger_position(self) -> int:
@@ -495,8 +565,7 @@ class PumpController(ABC):
             steps: The position of the plunger (in steps).
 
         """
-        plunger_position_packet = self._protocol.forge_report_plunger_position_packet()
-        response = self._write_and_read_from_pump(plunger_position_packet)
+        response = self._write_and_read_from_pump(self._plunger_position_packet)
         return int(response.data)
 
     @property
@@ -515,7 +584,7 @@ class PumpController(ABC):
             self.number_of_steps - self.current_steps
 
         """
-        return self.number_of_steps - self.current_steps
+        return self._number_of_steps - self.current_steps
 
     def get_volume(self) -> float:
         """
@@ -776,9 +845,8 @@ class PumpController(ABC):
             raw_valve_position: The raw position of the valve.
 
         """
-        valve_position_packet = self._protocol.forge_report_valve_position_packet()
-        response = self._write_and_read_from_pump(valve_position_packet)
-        return response.data
+        response = self._write_and_read_from_pump(self._valve_position_packet)
+        return response.data.decode()
 
     def get_valve_position(self, max_repeat: int = MAX_REPEAT_OPERATION) -> ValvePosition:
         """
@@ -800,7 +868,7 @@ class PumpController(ABC):
             valve_position = ValvePosition.try_decode(raw_valve_position)
             if valve_position is not None:
                 return valve_position
-            self._log.debug(f"Valve position request failed attempt {i+1}/{max_repeat}, {raw_valve_position} unknown")
+            self._log.debug("Valve position request failed attempt %d/%d, %s unknown", i + 1, max_repeat, raw_valve_position)
         raise ValueError(f'Valve position received was {raw_valve_position}. It is unknown')
 
     def set_valve_position(self, valve_position: ValvePosition, max_repeat: int = MAX_REPEAT_OPERATION, secure: bool = True) -> bool:
@@ -828,7 +896,7 @@ class PumpController(ABC):
             if self.get_valve_position() == valve_position:
                 return True
             else:
-                self._log.debug("Valve not in position, change attempt {}/{}".format(i + 1, max_repeat))
+                self._log.debug("Valve not in position, change attempt %d/%d", i + 1, max_repeat)
 
             if valve_position == ValvePosition.Input:
                 valve_position_packet = self._protocol.forge_valve_input_packet()
@@ -851,7 +919,7 @@ class PumpController(ABC):
 
             self.wait_until_idle()
 
-        self._log.debug("[PUMP {}] Too many failed attempts in set_valve_position!".format(self.name))
+        self._log.debug("[PUMP %s] Too many failed attempts in set_valve_position!", self.name)
         raise MaxRetriesExceededError('Repeated Error from pump {}'.format(self.name))
 
     def set_eeprom_config(self, operand_value: int) -> None:
@@ -864,6 +932,7 @@ class PumpController(ABC):
         """
         eeprom_config_packet = self._protocol.forge_eeprom_config_packet(operand_value)
         self._write_and_read_from_pump(eeprom_config_packet)
+        self._cached_eeprom = None
 
         eeprom_sign_packet = self._protocol.forge_eeprom_lowlevel_config_packet(sub_command=20, operand_value="pycont1")
         self._write_and_read_from_pump(eeprom_sign_packet)
@@ -902,6 +971,7 @@ class PumpController(ABC):
         """
         eeprom_packet = self._protocol.forge_eeprom_lowlevel_config_packet(sub_command=command, operand_value=operand)
         self._write_and_read_from_pump(eeprom_packet)
+        self._cached_eeprom = None
 
     def get_eeprom_config(self) -> str:
         """
@@ -911,41 +981,46 @@ class PumpController(ABC):
             eeprom_config: The configuration of the EEPROM.
 
         """
-        response = self._write_and_read_from_pump(self._protocol.forge_report_eeprom_packet())
-        return response.data
+        response = self._write_and_read_from_pump(self._eeprom_packet)
+        return response.data.decode()
 
-    def get_current_valve_config(self) -> str:
+    def get_current_valve_config(self, force: bool = False) -> str:
         """
         Infers the current valve configuration based on the EEPROM data.
+
+        The result is cached, since the EEPROM only changes through set_eeprom_config().
+
+        Args:
+            force: Query the pump again even if a cached result is available, default set to False.
         """
-        current_eeprom_config = self.get_eeprom_config().split(',')
-        valve_config = current_eeprom_config[10]
+        if not force and self._cached_eeprom is not None:
+            return self._cached_eeprom[1]
+
+        raw_eeprom_config = self.get_eeprom_config()
+        if self._cached_eeprom is not None and self._cached_eeprom[0] == raw_eeprom_config:
+            return self._cached_eeprom[1]
+
+        # only the first 11 fields are needed, so stop splitting after that
+        valve_config = raw_eeprom_config.split(',', 11)[10]
         # Valve config: IOBEXYZ
         # [I]nput, [O]utput, [B]ypass, [E]xtra positions: n*90 deg (e.g. 0 -> 0 deg, 2 -> 180 deg)
         # [X], [Y] allow plunger movement in [B] and [E], respectively (Y=1 for DIST to enable delivering to E!)
         # [Z] swap the bypass and extra position on a 4-position valve if a [Y] initialization command is issued.
 
-        if valve_config == "2013100":
-            # flash_eeprom_3_way_t_valve() AND flash_eeprom_3_way_y_valve(). Difference is jumper J2-5, check with ?28
-            current_valve_config = "3-WAY"
-        elif valve_config == "2033110":
-            # flash_eeprom_4_way_dist_valve()
-            current_valve_config = "4-WAY dist"
-        elif valve_config == "2130001":
-            # flash_eeprom_4_way_nondist_valve()
-            current_valve_config = "4-WAY nondist"
-        else:
+        current_valve_config = _VALVE_CONFIG_MAP.get(valve_config)
+        if current_valve_config is None:
             # e.g. DEBUG:pycont.DTStatus:Received /0`10,75,14,62,1,1,20,10,48,210,2013010,0,0,0,0,0,25,20,15,0000000
             print(valve_config)
             current_valve_config = "Unknown"
 
+        self._cached_eeprom = (raw_eeprom_config, current_valve_config)
         return current_valve_config
 
     def terminate(self) -> None:
         """
         Sends the command to terminate the current action.
         """
-        self._write_and_read_from_pump(self._protocol.forge_terminate_packet())
+        self._write_and_read_from_pump(self._terminate_packet)
 
 
 
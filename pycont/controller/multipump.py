@@ -6,16 +6,21 @@
 from __future__ import annotations
 
 import json
+import time
 from pathlib import Path
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
 from .._logger import create_logger
 from ..config import ValvePosition, BusConfig
 from ..io import PumpIO
 from . import PumpController
+from .base import MIN_POLL_INTERVAL
 
 if TYPE_CHECKING:
     from typing import Any, Union, Optional
+    from collections.abc import Callable, Collection
 
 
 class MultiPumpController(object):
@@ -26,8 +31,13 @@ class MultiPumpController(object):
         setup_config: The configuration of the setup.
 
     """
+
+    logger = create_logger(__qualname__)
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_workers = 0
+
     def __init__(self, *config: BusConfig, groups: dict = None):
-        self.logger = create_logger(self.__class__.__name__)
         self.pumps: dict[str, PumpController] = {}
 
         # Sets groups and default configs if provided in the config dictionary
@@ -81,8 +91,8 @@ class MultiPumpController(object):
         """
         Sets the pumps as attributes.
         """
-        for pump_name, pump in list(self.pumps.items()):
-            if hasattr(self, pump_name):
+        for pump_name, pump in self.pumps.items():
+            if pump_name in _reserved_names(type(self)) or pump_name in self.__dict__:
                 self.logger.warning(f"Pump named {pump_name} is a reserved attribute, please change name or do not use "
                                     f"this pump in attribute mode, rather use pumps['{pump_name}'']")
             else:
@@ -99,13 +109,8 @@ class MultiPumpController(object):
             pumps: A list of the pump objects.
 
         """
-        pumps = []
-        for pump_name in pump_names:
-            try:
-                pumps.append(self.pumps[pump_name])
-            except KeyError:
-                pass
-        return pumps
+        pumps = (self.pumps.get(pump_name) for pump_name in pump_names)
+        return [pump for pump in pumps if pump is not None]
 
     def get_pumps_in_group(self, group_name: str) -> Optional[list[PumpController]]:
         """
@@ -118,15 +123,11 @@ class MultiPumpController(object):
             pumps: A list of the pump objects in the group. None for non-existing groups.
 
         """
-        pumps = []
-        try:
-            pump_list = self.groups[group_name]
-        except KeyError:
+        pump_list = self.groups.get(group_name)
+        if pump_list is None:
             return None
 
-        for pump_name in pump_list:
-            pumps.append(self.pumps[pump_name])
-        return pumps
+        return [self.pumps[pump_name] for pump_name in pump_list]
 
     def get_all_pumps(self) -> dict[str, PumpController]:
         """
@@ -139,10 +140,15 @@ class MultiPumpController(object):
 
         return self.pumps
 
-    def apply_command_to_pumps(self, pump_names: list[str], command: str, *args, **kwargs) -> dict[str, Any]:
+    def apply_command_to_pumps(self, pump_names: Collection[str], command: str, *args, **kwargs) -> dict[str, Any]:
         """
         Applies a given command to the pumps.
 
+        Pumps that share a bus are commanded one after the other. If the pumps are spread over more than one bus,
+        each bus is handled in its own worker thread so that waiting on one bus does not hold up the others.
+        The 'is_idle' and 'is_busy' commands are batched so that each bus is only locked once,
+        except for pumps whose class overrides them.
+
         Args:
             pump_names (List): List containing the pump names.
 
@@ -156,13 +162,76 @@ class MultiPumpController(object):
             returns (Dict): Dictionary of the functions return.
 
         """
+        # status queries are read-only, so they can be sent to a whole bus in one pass
+        if not args and not kwargs:
+            if command == 'is_idle':
+                return self._bus_idle_snapshot(pump_names)
+            if command == 'is_busy' and all(_is_batchable(self.pumps[pump_name], 'is_busy') for pump_name in pump_names):
+                return { pump_name : not idle for pump_name, idle in self._bus_idle_snapshot(pump_names).items() }
+
+        return self._run_on_buses(pump_names, partial(self._apply_command_on_bus, command=command, args=args, kwargs=kwargs))
+
+    def _apply_command_on_bus(self, pump_names: Collection[str], *, command: str, args: tuple, kwargs: dict) -> dict[str, Any]:
         returns = {}
         for pump_name in pump_names:
             func = getattr(self.pumps[pump_name], command)
             returns[pump_name] = func(*args, **kwargs)
-
         return returns
 
+    def _run_on_buses(self, pump_names: Collection[str], func: Callable[[Collection[str]], dict[str, Any]]) -> dict[str, Any]:
+        """
+        Splits the pumps up by the bus they are on and calls func with the names of the pumps on each bus.
+        If there is more than one bus, each bus is handled concurrently in a worker thread.
+        """
+        buses: dict[int, list[str]] = {}
+        for pump_name in pump_names:
+            buses.setdefault(id(self.pumps[pump_name].pump_io), []).append(pump_name)
+
+        if len(buses) <= 1:
+            return func(pump_names)
+
+        executor = self._get_executor(len(buses))
+        futures = [ executor.submit(func, bus_pump_names) for bus_pump_names in buses.values() ]
+
+        bus_returns = {}
+        for future in futures:
+            bus_returns.update(future.result())
+
+        # keep the same ordering as pump_names, func may leave out pumps it didn't get to
+        return { pump_name : bus_returns[pump_name] for pump_name in pump_names if pump_name in bus_returns }
+
+    def _get_executor(self, num_buses: int) -> ThreadPoolExecutor:
+        """
+        Lazily create the thread pool used to dispatch commands to multiple buses at once.
+        The pool is replaced with a larger one if it has fewer workers than num_buses.
+        """
+        if self._executor is None or self._executor_workers < num_buses:
+            if self._executor is not None:
+                # let any commands still running on the old pool finish in the background
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=num_buses, thread_name_prefix='pycont-bus')
+            self._executor_workers = num_buses
+        return self._executor
+
+    def close(self) -> None:
+        """
+        Shuts down the worker threads used to command pumps on multiple buses.
+        The controller can still be used afterwards, the threads are started again when needed.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._executor_workers = 0
+
+    def __enter__(self) -> MultiPumpController:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Shuts down the worker threads via close()
+        """
+        self.close()
+
     def apply_command_to_all_pumps(self, command: str, *args, **kwargs) -> dict[str, Any]:
         """
         Applies a given command to all of the pumps.
@@ -178,7 +247,7 @@ class MultiPumpController(object):
             returns (Dict): Dictionary of the functions.
 
         """
-        return self.apply_command_to_pumps(list(self.pumps.keys()), command, *args, **kwargs)
+        return self.apply_command_to_pumps(self.pumps.keys(), command, *args, **kwargs)
 
     def apply_command_to_group(self, group_name: str, command: str, *args, **kwargs) -> dict[str, Any]:
         """
@@ -209,7 +278,7 @@ class MultiPumpController(object):
             False: The pumps have not been initialised.
 
         """
-        for pump in list(self.pumps.values()):
+        for pump in self.pumps.values():
             if not pump.is_initialized():
                 return False
         return True
@@ -222,17 +291,17 @@ class MultiPumpController(object):
             secure: Ensures everything is correct, default set to True.
 
         """
-        for pump in list(self.pumps.values()):
+        for pump in self.pumps.values():
             if not pump.is_initialized():
                 pump.initialize_valve_only(wait=False)
         self.wait_until_all_pumps_idle()
 
-        for pump in list(self.pumps.values()):
+        for pump in self.pumps.values():
             if not pump.is_initialized():
                 pump.set_valve_position(pump.config.init_valve_pos, secure=secure)
         self.wait_until_all_pumps_idle()
 
-        for pump in list(self.pumps.values()):
+        for pump in self.pumps.values():
             if not pump.is_initialized():
                 pump.initialize_no_valve(wait=False)
         self.wait_until_all_pumps_idle()
@@ -240,17 +309,86 @@ class MultiPumpController(object):
         self.apply_command_to_all_pumps('init_all_pump_parameters', secure=secure)
         self.wait_until_all_pumps_idle()
 
-    def wait_until_all_pumps_idle(self) -> None:
+    def wait_until_all_pumps_idle(self, *, poll_interval: Optional[float] = None) -> None:
         """
-        Sends the command 'wait_until_idle' to the pumps.
+        Waits until all the pumps are idle.
         """
-        self.apply_command_to_all_pumps('wait_until_idle')
+        self._wait_until_idle(self.pumps.keys(), poll_interval)
 
-    def wait_until_group_idle(self, group_name: str) -> None:
+    def wait_until_group_idle(self, group_name: str, *, poll_interval: Optional[float] = None) -> None:
         """
-        Sends the command ' wait_until_idle' to all pumps of a group.
+        Waits until all pumps of a group are idle.
+        """
+        self._wait_until_idle(self.groups[group_name], poll_interval)
+
+    def _wait_until_idle(self, pump_names: Collection[str], poll_interval: Optional[float] = None) -> None:
+        # pumps that change how they wait are left to do it their own way
+        custom_names = [ pump_name for pump_name in pump_names
+                         if not _is_batchable(self.pumps[pump_name], 'wait_until_idle', 'is_busy', 'is_idle') ]
+        if custom_names:
+            self.apply_command_to_pumps(custom_names, 'wait_until_idle')
+            pump_names = [ pump_name for pump_name in pump_names if pump_name not in custom_names ]
+
+        if poll_interval is None:
+            poll_interval = min(
+                (self.pumps[pump_name].pump_io.default_poll_interval for pump_name in pump_names), default=0
+            )
+
+        # back off the same way as PumpController.wait_until_idle()
+        delay = min(MIN_POLL_INTERVAL, poll_interval)
+        while True:
+            # once a pump is idle it stays idle, so only the pumps still busy need to be polled again
+            pump_names = [ pump_name for pump_name, idle in self._bus_idle_snapshot(pump_names).items() if not idle ]
+            if not pump_names:
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, poll_interval)
+
+    def _bus_idle_snapshot(self, pump_names: Collection[str]) -> dict[str, bool]:
         """
-        self.apply_command_to_group(group_name=group_name, command='wait_until_idle')
+        Queries the status of the given pumps, holding each bus for a single pass over all its pumps
+        instead of acquiring it once per pump.
+
+        Returns:
+            A dictionary of whether each pump is idle.
+        """
+        return self._run_on_buses(pump_names, self._query_idle_on_bus)
+
+    def _query_idle_on_bus(self, pump_names: Collection[str]) -> dict[str, bool]:
+        # pumps that override is_idle() are queried through it, the rest are sent as a batch
+        batch_names = [ pump_name for pump_name in pump_names if _is_batchable(self.pumps[pump_name], 'is_idle') ]
+
+        batch_idle = {}
+        if batch_names:
+            pumps = [ self.pumps[pump_name] for pump_name in batch_names ]
+            pump_io = pumps[0].pump_io
+            responses = pump_io.send_packets_and_read_responses([ pump.get_status_packet() for pump in pumps ])
+
+            for pump_name, pump, response in zip(batch_names, pumps, responses):
+                if response is None:
+                    # fall back to a regular status query, which will retry
+                    batch_idle[pump_name] = pump.is_idle()
+                else:
+                    batch_idle[pump_name] = pump.check_idle_status(response)
+
+        return {
+            pump_name : batch_idle[pump_name] if pump_name in batch_idle else self.pumps[pump_name].is_idle()
+            for pump_name in pump_names
+        }
+
+    def _query_until_busy_on_bus(self, pump_names: Collection[str]) -> dict[str, bool]:
+        """
+        Queries the given pumps one at a time, stopping at the first one that is busy.
+
+        Returns:
+            A dictionary of whether each pump is idle, for the pumps that were queried.
+        """
+        idle = {}
+        for pump_name in pump_names:
+            idle[pump_name] = self.pumps[pump_name].is_idle()
+            if not idle[pump_name]:
+                break
+        return idle
 
     def terminate_all_pumps(self) -> None:
         """
@@ -268,10 +406,8 @@ class MultiPumpController(object):
             False: The pumps are not idle.
 
         """
-        for pump in list(self.pumps.values()):
-            if not pump.is_idle():
-                return False
-        return True
+        # each bus stops at its first busy pump, so the rest of its pumps don't need to be queried
+        return all(self._run_on_buses(self.pumps.keys(), self._query_until_busy_on_bus).values())
 
     def are_pumps_busy(self) -> bool:
         """
@@ -315,7 +451,7 @@ class MultiPumpController(object):
         self.apply_command_to_pumps(pump_names, 'pump', volume_in_ml, speed_in=speed_in, wait=False)
 
         if wait:
-            self.apply_command_to_pumps(pump_names, 'wait_until_idle')
+            self._wait_until_idle(pump_names)
 
     def deliver(self, pump_names: list[str], volume_in_ml: float, to_valve: str = None, speed_out: int = None,
                 wait: bool = False, secure: bool = True) -> None:
@@ -347,7 +483,7 @@ class MultiPumpController(object):
         self.apply_command_to_pumps(pump_names, 'deliver', volume_in_ml, speed_out=speed_out, wait=False)
 
         if wait:
-            self.apply_command_to_pumps(pump_names, 'wait_until_idle')
+            self._wait_until_idle(pump_names)
 
     def transfer(self, pump_names: list[str], volume_in_ml: float, from_valve: str, to_valve: str,
                  speed_in: int = None, speed_out: int = None, secure: bool = True) -> None:
@@ -369,18 +505,29 @@ class MultiPumpController(object):
 
             secure: Ensures that everything is correct, default set to False.
 
+        Raises:
+            ValueError: None of the pumps were found, or one of them has no room left to pump into.
+
         """
-        volume_transferred = float('inf')  # Temporary value for the first cycle only, see below
-        for pump in self.get_pumps(pump_names):
-            candidate_volume = min(volume_in_ml, pump.remaining_volume)  # Smallest target and remaining is candidate
-            volume_transferred = min(candidate_volume, volume_transferred)  # Transferred is global minimum
+        pumps = self.get_pumps(pump_names)
+        if not pumps:
+            raise ValueError(f"No pumps found to transfer with: {pump_names}")
+
+        # a full pump/deliver cycle brings each plunger back to where it started,
+        # so the volume that can be moved per cycle is the same every time
+        max_volume_per_cycle = min(pump.remaining_volume for pump in pumps)
+        if max_volume_per_cycle <= 0:
+            raise ValueError("Cannot transfer, the pumps have no remaining volume: "
+                             + ", ".join(f"{pump.name}={pump.remaining_volume}" for pump in pumps))
 
-        self.pump(pump_names, volume_transferred, from_valve, speed_in=speed_in, wait=True, secure=secure)
-        self.deliver(pump_names, volume_transferred, to_valve, speed_out=speed_out, wait=True, secure=secure)
+        remaining_volume_to_transfer = volume_in_ml
+        while remaining_volume_to_transfer > 0:
+            volume_transferred = min(remaining_volume_to_transfer, max_volume_per_cycle)
 
-        remaining_volume_to_transfer = volume_in_ml - volume_transferred
-        if remaining_volume_to_transfer > 0:
-            self.transfer(pump_names, remaining_volume_to_transfer, from_valve, to_valve, speed_in, speed_out)
+            self.pump(pump_names, volume_transferred, from_valve, speed_in=speed_in, wait=True, secure=secure)
+            self.deliver(pump_names, volume_transferred, to_valve, speed_out=speed_out, wait=True, secure=secure)
+
+            remaining_volume_to_transfer -= volume_transferred
 
     def parallel_transfer(self, pumps_and_volumes_dict: dict, from_valve: ValvePosition, to_valve: ValvePosition,
                           speed_in: int = None, speed_out: int = None, secure: bool = True, wait: bool = False) -> bool:
@@ -402,41 +549,73 @@ class MultiPumpController(object):
 
             wait: Wait for the pumps to be idle, default set to False.
 
+        Raises:
+            ValueError: One of the pumps has no room left to pump into.
+
         """
 
-        remaining_volume = {}
-        volume_to_transfer = {}
+        all_pump_names = list(pumps_and_volumes_dict)
 
-        # Wait until all the pumps have pumped to start deliver
-        self.apply_command_to_pumps(list(pumps_and_volumes_dict.keys()), "wait_until_idle")
+        while len(pumps_and_volumes_dict) > 0:
+            pump_names = list(pumps_and_volumes_dict)
+            remaining_volume = {}
+            volume_to_transfer = {}
 
-        # Pump the target volume (or the maximum possible) for each pump
-        for pump_name, pump_target_volume in pumps_and_volumes_dict.items():
-            # Get pump
-            try:
-                pump = self.pumps[pump_name]
-            except KeyError:
-                self.logger.warning(f"Pump specified {pump_name} not found in the controller! (Available: {self.pumps}")
-                return False
+            # Wait until all the pumps have pumped to start deliver
+            self._wait_until_idle(pump_names)
 
-            # Find the volume to transfer (maximum pumpable or target, whatever is lower)
-            volume_to_transfer[pump_name] = min(pump_target_volume, pump.remaining_volume)
-            pump.pump(volume_in_ml=volume_to_transfer[pump_name], from_valve=from_valve, speed_in=speed_in, wait=False,
-                      secure=secure)
+            for pump_name, pump_target_volume in pumps_and_volumes_dict.items():
+                # Get pump
+                try:
+                    pump = self.pumps[pump_name]
+                except KeyError:
+                    self.logger.warning(f"Pump specified {pump_name} not found in the controller! (Available: {self.pumps}")
+                    return False
+
+                # Find the volume to transfer (maximum pumpable or target, whatever is lower)
+                volume_to_transfer[pump_name] = min(pump_target_volume, pump.remaining_volume)
+                if volume_to_transfer[pump_name] <= 0 < pump_target_volume:
+                    # the pump would never make progress, so fail before any pump is commanded this cycle
+                    raise ValueError(f"Cannot transfer, pump {pump_name} has no remaining volume: {pump.remaining_volume}")
+
+                # Calculate remaining volume
+                remaining_volume[pump_name] = pump_target_volume - volume_to_transfer[pump_name]
+
+            # Pump the target volume (or the maximum possible) for each pump
+            for pump_name, volume_to_pump in volume_to_transfer.items():
+                pump = self.pumps[pump_name]
+                pump.pump(volume_in_ml=volume_to_pump, from_valve=from_valve, speed_in=speed_in, wait=False,
+                          secure=secure)
 
-            # Calculate remaining volume
-            remaining_volume[pump_name] = pump_target_volume - volume_to_transfer[pump_name]
+            # Wait until all the pumps have pumped to start deliver
+            self._wait_until_idle(pump_names)
 
-        # Wait until all the pumps have pumped to start deliver
-        self.apply_command_to_pumps(list(pumps_and_volumes_dict.keys()), "wait_until_idle")
+            for pump_name, volume_to_deliver in volume_to_transfer.items():
+                pump = self.pumps[pump_name]  # This cannot fail otherwise it would have failed in pumping ;)
+                pump.deliver(volume_in_ml=volume_to_deliver, wait=False, to_valve=to_valve, speed_out=speed_out)
 
-        for pump_name, volume_to_deliver in volume_to_transfer.items():
-            pump = self.pumps[pump_name]  # This cannot fail otherwise it would have failed in pumping ;)
-            pump.deliver(volume_in_ml=volume_to_deliver, wait=False, to_valve=to_valve, speed_out=speed_out)
+            # Repeat for the pumps that still have volume left to transfer
+            pumps_and_volumes_dict = {pump: volume for pump, volume in remaining_volume.items() if volume > 0}
 
-        left_to_pump = {pump: volume for pump, volume in remaining_volume.items() if volume > 0}
-        if len(left_to_pump) > 0:
-            self.parallel_transfer(left_to_pump, from_valve, to_valve, speed_in, speed_out, secure)
-        elif wait is True:  # If no more pumping is needed wait if needed
-            self.apply_command_to_pumps(list(pumps_and_volumes_dict.keys()), "wait_until_idle")
+        if wait is True:  # If no more pumping is needed wait if needed
+            self._wait_until_idle(all_pump_names)
         return True
+
+
+def _is_batchable(pump: PumpController, *methods: str) -> bool:
+    """
+    Whether the batched status queries can stand in for the given methods of the pump,
+    which is only the case if the pump's class doesn't override them.
+    """
+    pump_type = type(pump)
+    return all(getattr(pump_type, method) is getattr(PumpController, method) for method in methods)
+
+
+_reserved_names_cache: dict[type, frozenset[str]] = {}
+
+def _reserved_names(cls: type) -> frozenset[str]:
+    """Names that pumps cannot be set as attributes with, see MultiPumpController.set_pumps_as_attributes()"""
+    names = _reserved_names_cache.get(cls)
+    if names is None:
+        names = _reserved_names_cache[cls] = frozenset(dir(cls)) | { 'pumps', 'groups', 'logger' }
+    return names
@@ -39,7 +39,7 @@ class VirtualPumpIO(PumpIO):
 
     def write(self, packet):
         str_to_send = packet.to_string()
-        self.logger.debug("Virtually sending {}".format(str_to_send))
+        self.logger.debug("Virtually sending %s", str_to_send)
 
     def readline(self):
         raise PumpIOTimeOutError
@@ -136,19 +136,19 @@ class VirtualMultiPumpController(MultiPumpController):
         self._io = []
 
         # Sets groups and default configs if provided in the config dictionary
-        self.groups = setup_config['groups'] if 'groups' in setup_config else {}
-        self.default_config = setup_config['default'] if 'default' in setup_config else {}
+        self.groups = setup_config.get('groups', {})
+        self.default_config = setup_config.get('default', {})
 
         if "hubs" in setup_config:  # This implements the "new" behaviour with multiple hubs
             for hub_config in setup_config["hubs"]:
                 # Each hub has its own I/O config. Create a PumpIO object per each hub and reuse it with -1 after append
                 self._io.append(VirtualPumpIO.from_config(hub_config['io']))
-                for pump_name, pump_config in list(hub_config['pumps'].items()):
+                for pump_name, pump_config in hub_config['pumps'].items():
                     full_pump_config = self._default_pump_config(pump_config)
                     self.pumps[pump_name] = VirtualC3000Controller.from_config(self._io[-1], pump_name, full_pump_config)
         else:  # This implements the "old" behaviour with one hub per object instance / json file
             self._io = VirtualPumpIO.from_config(setup_config['io'])
-            for pump_name, pump_config in list(setup_config['pumps'].items()):
+            for pump_name, pump_config in setup_config['pumps'].items():
                 full_pump_config = self._default_pump_config(pump_config)
                 self.pumps[pump_name] = VirtualC3000Controller.from_config(self._io, pump_name, full_pump_config)
 
@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import itertools
 from enum import Enum
 from typing import TYPE_CHECKING
 
@@ -17,6 +16,9 @@ if TYPE_CHECKING:
 DTStart = '/'
 DTStop = '\r'
 
+_DTSTART_BYTES = DTStart.encode()
+_DTSTOP_BYTES = DTStop.encode()
+
 
 class Address(Enum):
     Switch0 = '1'
@@ -38,10 +40,34 @@ class Address(Enum):
     Master = '0'
     Broadcast = '_'
 
+    value_bytes: bytes
+
     @classmethod
     def from_switch(cls, switch: str) -> Address:
         return _ADDRESS_FROM_SWITCH[switch]
 
+
+# looked up once, attribute access on an Enum class is comparatively slow
+_MASTER_ADDRESS = Address.Master
+
+# packets are built for every command, so keep the encoded address on each member
+for _address in Address:
+    _address.value_bytes = _address.value.encode()
+del _address
+
+# The address is looked up for every response, so index a table by character ordinal
+# instead of hashing into a dict or going through the Enum constructor.
+def _ord_table(mapping: dict[str, Address]) -> tuple[Optional[Address], ...]:
+    table: list[Optional[Address]] = [None] * 256
+    for char, address in mapping.items():
+        table[ord(char)] = address
+    return tuple(table)
+
+_ADDRESS_BY_VALUE = _ord_table({
+    address.value : address
+    for address in Address
+})
+
 _ADDRESS_FROM_SWITCH = {
     '0' : Address.Switch0,
     '1' : Address.Switch1,
@@ -76,15 +102,18 @@ class DTCommand(object):
         (for more details see http://www.tricontinent.com/products/cseries-syringe-pumps)
         """
 
-    def __init__(self, command: PumpCommand, operand: str = ''):
+    __slots__ = ('command', 'operand', '_bytes')
+
+    def __init__(self, command: PumpCommand, operand: Optional[str] = ''):
         self.command = command
-        self.operand = operand.encode()
+        self.operand = operand.encode() if operand else b''
+        self._bytes = command.value.encode() + self.operand
 
     def to_array(self) -> bytearray:
-        return bytearray(itertools.chain(self.command.value.encode(), self.operand))
+        return bytearray(self._bytes)
 
     def to_bytes(self) -> bytes:
-        return bytes(itertools.chain(self.command.value.encode(), self.operand))
+        return self._bytes
 
     def __str__(self):
         return self.command.name
@@ -101,59 +130,68 @@ class DTInstructionPacket:
         (for more details see http://www.tricontinent.com/products/cseries-syringe-pumps)
         """
 
+    __slots__ = ('address', 'dtcommands', '_bytes')
+
     def __init__(self, address: Address, dtcommands: Iterable[DTCommand]):
         self.address = address
         self.dtcommands = tuple(dtcommands)
+        # packets are immutable and often resent (e.g. status polling), so serialize them once up front
+        self._bytes = b''.join((
+            _DTSTART_BYTES,
+            self.address.value_bytes,
+            *(dtcommand.to_bytes() for dtcommand in self.dtcommands),
+            _DTSTOP_BYTES,
+        ))
 
     def __str__(self) -> str:
         return f"[{self.address.name}: {', '.join(str(cmd) for cmd in self.dtcommands)}]"
 
     def to_array(self) -> bytearray:
-        return bytearray(itertools.chain(
-            DTStart.encode(),
-            self.address.value.encode(),
-            *(dtcommand.to_bytes() for dtcommand in self.dtcommands),
-            DTStop.encode(),
-        ))
+        return bytearray(self.to_bytes())
 
     def to_bytes(self) -> bytes:
-        return bytes(self.to_array())
+        return self._bytes
 
 
-# TODO do all processing in bytes and eliminate this
 class DTStatusDecodeError(Exception): pass
 
 class DTStatus(object):
     """ This class is used to represent a DTstatus, the response of the device from a command.
 
+        The response is parsed as bytes; the status and data fields are left undecoded.
+
         Args:
             response: The response from the device
 
         (for more details see http://www.tricontinent.com/products/cseries-syringe-pumps)
         """
 
+    __slots__ = ('address', 'status', 'data')
+
+    logger = create_logger(__qualname__)
+
     address: Optional[Address]
-    status: Optional[str]
-    data: Optional[str]
+    status: Optional[bytes]
+    data: Optional[bytes]
 
     def __init__(self, response: bytes):
-        self.logger = create_logger(self.__class__.__name__)
-        try:
-            raw_response = response.decode()
-        except UnicodeDecodeError:
-            raise DTStatusDecodeError('Could not decode {!r}'.format(response)) from None
+        if not response.isascii():
+            raise DTStatusDecodeError('Could not decode {!r}'.format(response))
 
         self.status = None
         self.data = None
-        self._extract_response_parts(raw_response)
+        self._extract_response_parts(response)
 
-    def _extract_response_parts(self, response: str) -> None:
-        info = response.rstrip().rstrip('\x03').lstrip(DTStart)
+    def _extract_response_parts(self, response: bytes) -> None:
+        # frames look like /<addr><status><data>\x03\r\n
+        info = response.rstrip(b'\r\n\x03')
+        if info[:1] == _DTSTART_BYTES:
+            info = info[1:]
+        if not info:
+            raise DTStatusDecodeError('Empty response {!r}'.format(response))
 
-        try:
-            self.address = Address(info[0])
-        except ValueError:
-            self.address = None
+        # indexing bytes gives the ordinal directly
+        self.address = _ADDRESS_BY_VALUE[info[0]]
 
-        if self.address == Address.Master:
-            self.status, self.data = info[1], info[2:]
+        if self.address is _MASTER_ADDRESS:
+            self.status, self.data = info[1:2], info[2:]
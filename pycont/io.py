@@ -5,27 +5,31 @@
 
 from __future__ import annotations
 
+import os
 import time
+import logging
 import serial
 import socket
-import select
+import selectors
 import threading
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 
 from ._logger import create_logger
-from .config import Address, IOConfig
+from .config import IOConfig
 
 from .dtprotocol import (
    DTInstructionPacket,
    DTStatus,
    DTStatusDecodeError,
-   DTStart,
-   DTStop,
+   _DTSTART_BYTES,
+   _DTSTOP_BYTES,
+   _MASTER_ADDRESS,
 )
 
 if TYPE_CHECKING:
     from typing import Optional, Any
+    from collections.abc import Sequence
 
 
 #: default Input/Output (I/O) Baudrate
@@ -34,6 +38,8 @@ DEFAULT_IO_BAUDRATE = 9600
 #: Default timeout for I/O operations
 DEFAULT_IO_TIMEOUT = 1.0
 
+_DTSTOP_LEN = len(_DTSTOP_BYTES)
+
 
 class PumpIOTimeOutError(Exception):
     """
@@ -43,7 +49,8 @@ class PumpIOTimeOutError(Exception):
 
 
 class PumpIO(ABC):
-    default_poll_interval = 0.1
+    #: Longest time to wait between status polls when waiting for pumps to become idle
+    default_poll_interval = 0.2
 
     @abstractmethod
     def send_packet(self, packet: DTInstructionPacket) -> None:
@@ -59,6 +66,24 @@ class PumpIO(ABC):
         """
         raise NotImplementedError
 
+    def send_packets_and_read_responses(self, packets: Sequence[DTInstructionPacket]) -> list[Optional[DTStatus]]:
+        """Send several packets over the bus, reading the response to each one before sending the next.
+
+        The bus is half-duplex and every response is addressed to the bus master, so the packets cannot simply
+        be written back-to-back. Implementations should instead hold the bus for the whole sequence.
+
+        Returns:
+            The responses in the same order as the packets. The response is None for any packet that timed out
+            or whose response could not be decoded.
+        """
+        responses: list[Optional[DTStatus]] = []
+        for packet in packets:
+            try:
+                responses.append(self.send_packet_and_read_response(packet))
+            except (PumpIOTimeOutError, DTStatusDecodeError):
+                responses.append(None)
+        return responses
+
     @staticmethod
     def from_config(config: IOConfig) -> PumpIO:
         opts = dict(config.options)
@@ -70,6 +95,11 @@ class PumpIO(ABC):
                 family = opts.get('family', socket.AF_INET),
                 type = opts.get('sock_type', socket.SOCK_STREAM)
             )
+            # DT packets are only a few bytes each, don't let Nagle's algorithm hold them back
+            # waiting for the previous reply to be acknowledged. Can still be overridden by sockopts.
+            if sock.family in (socket.AF_INET, socket.AF_INET6) and sock.type == socket.SOCK_STREAM:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
             sockopts = opts.get('sockopts', ())
             for level, name, value in sockopts:
                 sock.setsockopt(level, name, value)
@@ -83,20 +113,102 @@ class PumpIO(ABC):
         raise ValueError("unsupported I/O type: " + config.io_type)
 
 
+class _ResponseBuffer:
+    """
+    Accumulates received bytes and splits complete DT frames out of them.
+
+    Anything outside of a frame, such as the newline that follows each response, is discarded.
+    The buffer is preallocated and data is tracked between a read and a write offset, so that
+    extracting a frame does not shift the rest of the buffer.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self._buf = bytearray(capacity)
+        self._pos = 0  # start of unconsumed data
+        self._end = 0  # end of received data
+        self._scan_pos = 0
+
+    def _reserve(self, nbytes: int) -> None:
+        """Makes room for at least nbytes after the received data."""
+        if len(self._buf) - self._end >= nbytes:
+            return
+
+        # move the unconsumed data back to the front, growing the buffer only if that isn't enough
+        pending = self._end - self._pos
+        with memoryview(self._buf) as view:
+            view[:pending] = view[self._pos:self._end]
+        self._scan_pos = max(self._scan_pos - self._pos, 0)
+        self._pos, self._end = 0, pending
+
+        if len(self._buf) - pending < nbytes:
+            self._buf.extend(bytes(nbytes - (len(self._buf) - pending)))
+
+    def extend(self, data: bytes) -> None:
+        nbytes = len(data)
+        self._reserve(nbytes)
+        self._buf[self._end:self._end + nbytes] = data
+        self._end += nbytes
+
+    def recv_into(self, sock: socket.socket, nbytes: int) -> int:
+        """Receives up to nbytes from the socket directly into the buffer, returning the number of bytes read."""
+        self._reserve(nbytes)
+        with memoryview(self._buf) as view:
+            received = sock.recv_into(view[self._end:self._end + nbytes])
+        self._end += received
+        return received
+
+    def clear(self) -> None:
+        self._pos = self._end = 0
+        self._scan_pos = 0
+
+    def next_frame(self) -> Optional[bytes]:
+        """Returns the next complete frame, or None if there isn't one yet."""
+        buf = self._buf
+        find = buf.find
+        end = self._end
+        start_idx = find(_DTSTART_BYTES, self._pos, end)
+        if start_idx < 0:
+            self.clear()
+            return None
+
+        stop_idx = find(_DTSTOP_BYTES, max(start_idx, self._scan_pos), end)
+        if stop_idx < 0:
+            # the partial frame has been searched already, so resume from its end once more data arrives
+            self._pos = start_idx
+            self._scan_pos = end - _DTSTOP_LEN + 1
+            return None
+
+        self._scan_pos = 0
+        split_idx = stop_idx + _DTSTOP_LEN
+        # copy the frame out through a view, slicing the bytearray first would copy it twice
+        with memoryview(buf) as view:
+            frame = view[start_idx:split_idx].tobytes()
+
+        if split_idx == end:
+            self.clear()
+        else:
+            self._pos = split_idx
+        return frame
+
+
 class SerialIO(PumpIO):
     """
     Pump I/O communication over a serial port.
     """
 
     _serial: serial.Serial = None
+    _selector: Optional[selectors.BaseSelector] = None
+    _fd: Optional[int] = None
+    _debug_extra: Optional[dict[str, Any]] = None
+    _log = create_logger(__qualname__)
 
     def __init__(self, port: str, baudrate: int = DEFAULT_IO_BAUDRATE, timeout: float = DEFAULT_IO_TIMEOUT):
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
 
-        self._log = create_logger(self.__class__.__name__)
         self._lock = threading.Lock()
+        self._rx_buf = _ResponseBuffer()
 
         self.open()
 
@@ -132,7 +244,23 @@ class SerialIO(PumpIO):
         # use non-blocking reads, so timeout is set to 0
         # the timeout attribute on self only applies to send_packet_and_read_response() and is handled there.
         self._serial = serial.Serial(self.port, self.baudrate, timeout=0)
-        self._log.debug("Opening port '%s'", self._serial, extra=self._debug_info())
+        # where the port has a file descriptor (POSIX), wait for responses on it instead of polling.
+        # Serial always has a fileno() method, but it raises io.UnsupportedOperation where there is none (Windows).
+        try:
+            self._fd = self._serial.fileno()
+        except (AttributeError, OSError):
+            pass
+        else:
+            self._selector = selectors.DefaultSelector()
+            self._selector.register(self._fd, selectors.EVENT_READ)
+        # the port settings are fixed while it is open, so the logging extras are only built once
+        self._debug_extra = dict(
+            port = self._serial.port,
+            baudrate = self._serial.baudrate,
+            timeout = self._serial.timeout
+        )
+        if self._log.isEnabledFor(logging.DEBUG):
+            self._log.debug("Opening port '%s'", self._serial, extra=self._debug_extra)
 
     def close(self) -> None:
         """
@@ -142,8 +270,14 @@ class SerialIO(PumpIO):
         # Or if the PumpIO never opened a connection.
         if self._serial is not None:
             self._serial.close()
-            self._log.debug("Closing port '%s'", self._serial, extra=self._debug_info())
+            if self._log.isEnabledFor(logging.DEBUG):
+                self._log.debug("Closing port '%s'", self._serial, extra=self._debug_extra)
             del self._serial
+            del self._debug_extra
+            if self._selector is not None:
+                self._selector.close()
+                del self._selector
+                del self._fd
 
     def is_connected(self) -> bool:
         return self._serial is not None
@@ -151,13 +285,6 @@ class SerialIO(PumpIO):
     def __bool__(self) -> bool:
         return self.is_connected()
 
-    def _debug_info(self) -> dict[str, Any]:
-        return dict(
-            port = self._serial.port,
-            baudrate = self._serial.baudrate,
-            timeout = self._serial.timeout
-        )
-
     def send_packet(self, packet: DTInstructionPacket) -> None:
         if self._serial is None:
             raise RuntimeError('connection is closed')
@@ -176,38 +303,72 @@ class SerialIO(PumpIO):
 
         """
         bytes_to_send = packet.to_bytes()
-        self._log.debug(f"Sending {bytes_to_send!r}")
-        self._serial.write(bytes_to_send)
+        self._log.debug("Sending %r", bytes_to_send)
+        self._write(bytes_to_send)
+
+    def _write(self, data: bytes) -> None:
+        # DT packets are short enough that a single os.write() on the port's fd will normally take the whole
+        # packet, which skips pyserial's write loop. Anything left over goes through pyserial as usual.
+        if self._fd is not None:
+            try:
+                written = os.write(self._fd, data)
+            except BlockingIOError:
+                written = 0
+            if written == len(data):
+                return
+            data = data[written:]
+        self._serial.write(data)
 
     def _read_response(self) -> Optional[DTStatus]:
         if self._serial is None:
             raise RuntimeError('connection is closed')
 
-        msg = self._serial.readline()
-        if not msg:
-            return None
+        while (msg := self._read_frame()) is not None:
+            try:
+                self._log.debug("Received %r", msg)
+                response = DTStatus(msg)
+            except DTStatusDecodeError:
+                self._log.warning("Failed to decode response: %r", msg)
+                continue
 
-        try:
-            self._log.debug(F"Received {msg!r}")
-            response = DTStatus(msg)
-        except DTStatusDecodeError:
-            self._log.warning(f"Failed to decode response: {msg!r}")
-            return None
+            # filter out any packets not addressed to the bus master
+            if response.address is _MASTER_ADDRESS:
+                return response
 
-        # filter out any packets not addressed to the bus master
-        if response.address != Address.Master:
+        return None
+
+    def _read_frame(self) -> Optional[bytes]:
+        """
+        Split off the next complete response if one is already buffered. Otherwise drain whatever
+        is waiting on the port into the receive buffer with a single read and try again.
+        """
+        frame = self._rx_buf.next_frame()
+        if frame is not None:
+            return frame
+
+        waiting = self._serial.in_waiting
+        if not waiting:
             return None
-        return response
+        self._rx_buf.extend(self._serial.read(waiting))
+        return self._rx_buf.next_frame()
 
     def _get_next_response(self, poll_interval: float = 0.2) -> DTStatus:
-        start_time = time.time()
-        while (time.time() - start_time) < self.timeout:
+        monotonic = time.monotonic
+        read_response = self._read_response
+        selector = self._selector
+
+        deadline = monotonic() + self.timeout
+        while (now := monotonic()) < deadline:
             # try to read a response from the device
-            response = self._read_response()
+            response = read_response()
             if response is not None:
                 return response
 
-            time.sleep(poll_interval)
+            if selector is not None:
+                # block until more data arrives, for no longer than the time remaining
+                selector.select(deadline - now)
+            else:
+                time.sleep(poll_interval)
 
         self._log.debug("Timeout expired while waiting for response!")
         raise PumpIOTimeOutError
@@ -217,11 +378,28 @@ class SerialIO(PumpIO):
             raise RuntimeError('connection is closed')
 
         with self._lock:
-            # flush any incoming packets before beginning the new command
-            self._serial.reset_input_buffer()
+            return self._send_packet_and_read_response(packet)
 
-            self._send_packet(packet)
-            return self._get_next_response()
+    def send_packets_and_read_responses(self, packets: Sequence[DTInstructionPacket]) -> list[Optional[DTStatus]]:
+        if self._serial is None:
+            raise RuntimeError('connection is closed')
+
+        responses: list[Optional[DTStatus]] = []
+        with self._lock:
+            for packet in packets:
+                try:
+                    responses.append(self._send_packet_and_read_response(packet))
+                except PumpIOTimeOutError:
+                    responses.append(None)
+        return responses
+
+    def _send_packet_and_read_response(self, packet: DTInstructionPacket) -> DTStatus:
+        # flush any incoming packets before beginning the new command
+        self._serial.reset_input_buffer()
+        self._rx_buf.clear()
+
+        self._send_packet(packet)
+        return self._get_next_response()
 
 
 class SocketIO(PumpIO):
@@ -234,6 +412,8 @@ class SocketIO(PumpIO):
     Defaults to a new threading.Lock instance.
     """
 
+    _log = create_logger(__qualname__)
+
     def __init__(self, sock: socket.socket, timeout: float = DEFAULT_IO_TIMEOUT, *, lock: Any = None):
         self.socket = sock
         self.timeout = timeout
@@ -242,8 +422,12 @@ class SocketIO(PumpIO):
         self.socket.settimeout(0)
 
         self._lock = lock if lock is not None else threading.Lock()
-        self._buf = bytearray()
-        self._log = create_logger(self.__class__.__name__)
+        # leave room for a pending partial frame on top of a full read, so that recv_into() rarely has to compact
+        self._buf = _ResponseBuffer(2 * self._recv_size)
+
+        # register the socket once rather than building a new select() set for every read
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self.socket, selectors.EVENT_READ)
 
     def send_packet(self, packet: DTInstructionPacket) -> None:
         with self._lock:
@@ -251,69 +435,91 @@ class SocketIO(PumpIO):
 
     def _send_packet(self, packet: DTInstructionPacket) -> None:
         bytes_to_send = packet.to_bytes()
-        self._log.debug(f"Sending {bytes_to_send!r}")
+        self._log.debug("Sending %r", bytes_to_send)
         self.socket.sendall(bytes_to_send)
 
-    # why didn't they just use bytes?
-    _dtstart = DTStart.encode()
-    _dtstop = DTStop.encode()
-    def _extract_next_response_from_buffer(self, buf: bytearray) -> Optional[bytes]:
-        start_idx = buf.find(self._dtstart)
-        if start_idx < 0:
-            buf.clear()
-            return None
+    _recv_size = 4096
 
-        stop_idx = buf.find(self._dtstop, start_idx)
-        if stop_idx < 0:
-            return None
-
-        split_idx = stop_idx + len(self._dtstop)
-        response = bytes(buf[start_idx:split_idx])
-        del buf[:split_idx]
-        return response
-
-
-    def _recv(self) -> Optional[bytes]:
-        ready, _, _ = select.select([self.socket], (), (), 0)
-        if not ready:
+    def _recv(self) -> Optional[int]:
+        """
+        Receives directly into the response buffer, returning the number of bytes read,
+        or None if there was nothing to read.
+        """
+        if not self._selector.select(0):
             return None
-        return self.socket.recv(4096)
+        return self._buf.recv_into(self.socket, self._recv_size)
 
     def _recv_status(self) -> Optional[DTStatus]:
-        data = self._recv()
+        # a response that is already buffered doesn't need another trip to the socket
+        response = self._next_buffered_status()
+        if response is not None:
+            return response
 
-        if data is None:
+        nbytes = self._recv()
+
+        if nbytes is None:
             return None
 
-        if data == b'':
+        if nbytes == 0:
             raise EOFError('socket closed on remote end')
 
-        self._buf += data
+        # drain everything that is ready before parsing, an EOF will be picked up by the next call
+        while nbytes:
+            try:
+                nbytes = self._buf.recv_into(self.socket, self._recv_size)
+            except BlockingIOError:
+                break
+
+        return self._next_buffered_status()
 
-        while (msg := self._extract_next_response_from_buffer(self._buf)) is not None:
+    def _next_buffered_status(self) -> Optional[DTStatus]:
+        while (msg := self._buf.next_frame()) is not None:
             response = DTStatus(msg)
-            if response.address == Address.Master:
-                self._log.debug(F"Received {msg!r}")
+            if response.address is _MASTER_ADDRESS:
+                self._log.debug("Received %r", msg)
                 return response
 
         return None
 
     def _reset_input_buffer(self) -> None:
-        while self._recv() is not None:
-            pass
+        # stop on EOF as well, _recv_status() will raise it
+        while self._recv():
+            self._buf.clear()
         self._buf.clear()
 
     def send_packet_and_read_response(self, packet: DTInstructionPacket) -> DTStatus:
         with self._lock:
-            self._reset_input_buffer()
+            return self._send_packet_and_read_response(packet)
 
-            self._send_packet(packet)
+    def send_packets_and_read_responses(self, packets: Sequence[DTInstructionPacket]) -> list[Optional[DTStatus]]:
+        responses: list[Optional[DTStatus]] = []
+        with self._lock:
+            for packet in packets:
+                try:
+                    responses.append(self._send_packet_and_read_response(packet))
+                except (PumpIOTimeOutError, DTStatusDecodeError):
+                    responses.append(None)
+        return responses
+
+    def _send_packet_and_read_response(self, packet: DTInstructionPacket) -> DTStatus:
+        self._reset_input_buffer()
+
+        self._send_packet(packet)
+
+        monotonic = time.monotonic
+        recv_status = self._recv_status
+        select = self._selector.select
 
-            start_time = time.time()
-            while (time.time() - start_time) < self.timeout:
-                response = self._recv_status()
-                if response is not None:
-                    return response
-                time.sleep(0.2)
+        deadline = monotonic() + self.timeout
+        while True:
+            response = recv_status()
+            if response is not None:
+                return response
 
-            raise PumpIOTimeOutError
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            # block until more data arrives instead of sleeping a fixed interval
+            select(remaining)
+
+        raise PumpIOTimeOutError
@@ -112,14 +112,17 @@ class PumpStatus(NamedTuple):
         return self.code.is_error()
 
     @classmethod
-    def try_decode(cls, raw_code: str) -> Optional[PumpStatus]:
-        return _STATUS_DECODE.get(raw_code)
+    def try_decode(cls, raw_code: bytes) -> Optional[PumpStatus]:
+        if len(raw_code) != 1:
+            return None
+        return _STATUS_DECODE[raw_code[0]]
 
-_STATUS_DECODE = {
-    raw_code : PumpStatus(busy, status_code)
-    for status_code in StatusCode
-    for busy, raw_code in zip((False, True), status_code.value)
-}
+# the status byte is decoded on every status poll, so index directly by its value
+_STATUS_DECODE: list[Optional[PumpStatus]] = [None] * 256
+for _status_code in StatusCode:
+    for _busy, _raw_code in zip((False, True), _status_code.value):
+        _STATUS_DECODE[ord(_raw_code)] = PumpStatus(_busy, _status_code)
+del _status_code, _busy, _raw_code
 
 
 class ValvePosition(Enum):
@@ -135,22 +138,29 @@ class ValvePosition(Enum):
     Five = '5'
     Six = '6'
 
+    _is_6way: bool
+
     def is_6way(self) -> bool:
-        return self in _VALVE_6WAY_LIST
+        return self._is_6way
 
     @classmethod
     def get_6way_position(cls, pos_num: int) -> ValvePosition:
         """Get the corresponding 6-way valve position for integers 1..6"""
-        return _VALVE_6WAY_LIST[pos_num - 1]
+        return _VALVE_6WAY_BY_NUM[pos_num]
 
     @classmethod
     def try_decode(cls, raw_pos: str) -> Optional[ValvePosition]:
-        return _VALVE_POS_DECODE.get(raw_pos)
-
-_VALVE_POS_DECODE = {
-    valve_pos.value : valve_pos
-    for valve_pos in ValvePosition
-}
+        if len(raw_pos) != 1:
+            return None
+        code = ord(raw_pos)
+        return _VALVE_POS_DECODE[code] if code < 128 else None
+
+# indexed by character code, accepting either case so that callers never need to normalize the raw position first
+_VALVE_POS_DECODE: list[Optional[ValvePosition]] = [None] * 128
+for _valve_pos in ValvePosition:
+    for _raw_pos in (_valve_pos.value, _valve_pos.value.upper()):
+        _VALVE_POS_DECODE[ord(_raw_pos)] = _valve_pos
+del _valve_pos, _raw_pos
 
 #: 6 way valve
 _VALVE_6WAY_LIST = (
@@ -162,6 +172,14 @@ _VALVE_6WAY_LIST = (
     ValvePosition.Six,
 )
 
+# keyed by position number, so that 0 and negative numbers are rejected rather than wrapping around
+_VALVE_6WAY_BY_NUM = dict(enumerate(_VALVE_6WAY_LIST, start=1))
+
+# hashing an Enum member goes through Enum.__hash__ in Python, so store the flag on each member instead
+for _valve_pos in ValvePosition:
+    _valve_pos._is_6way = _valve_pos in _VALVE_6WAY_LIST
+del _valve_pos
+
 
 class PumpProtocol:
     """
@@ -174,6 +192,7 @@ class PumpProtocol:
     def __init__(self, address: Address):
         self._log = create_logger(self.__class__.__name__)
         self.address = address
+        self._static_packets: dict[tuple[PumpCommand, bool], DTInstructionPacket] = {}
 
     def forge_packet(self, *dtcommands: DTCommand, execute: bool = True) -> DTInstructionPacket:
         """
@@ -189,11 +208,21 @@ class PumpProtocol:
 
         """
         # self._log.debug("Forging packet with {} and execute set to {}".format(dtcommands, execute))
-        dtcommands = list(dtcommands)
         if execute:
-            dtcommands.append(DTCommand(PumpCommand.Execute))
+            dtcommands = (*dtcommands, _EXECUTE_CMD)
         return DTInstructionPacket(self.address, dtcommands)
 
+    def _forge_static_packet(self, command: PumpCommand, execute: bool = True) -> DTInstructionPacket:
+        """
+        Returns the packet for a command that takes no operand. Packets are immutable, so each one is
+        only forged once per protocol instance.
+        """
+        key = (command, execute)
+        packet = self._static_packets.get(key)
+        if packet is None:
+            packet = self._static_packets[key] = self.forge_packet(DTCommand(command), execute=execute)
+        return packet
+
     """
 
     .. note:: The following functions should be generated automatically but not necessary as of yet.
@@ -272,7 +301,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for initialising microstep mode.
 
         """
-        if operand_value not in list(range(3)):
+        if operand_value not in range(3):
             raise ValueError('Microstep operand must be in [0-2], you entered {}'.format(operand_value))
         dtcommand = DTCommand(PumpCommand.MicroStepMode, str(operand_value))
         return self.forge_packet(dtcommand)
@@ -372,7 +401,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for the input into a valve on the device.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.SelectValveInput))
+        return self._forge_static_packet(PumpCommand.SelectValveInput)
 
     def forge_valve_output_packet(self) -> DTInstructionPacket:
         """
@@ -382,7 +411,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for the output from a valve on the device.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.SelectValveOutput))
+        return self._forge_static_packet(PumpCommand.SelectValveOutput)
 
     def forge_valve_bypass_packet(self) -> DTInstructionPacket:
         """
@@ -392,7 +421,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for bypassing a valve on the device.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.SelectValveBypass))
+        return self._forge_static_packet(PumpCommand.SelectValveBypass)
 
     def forge_valve_extra_packet(self) -> DTInstructionPacket:
         """
@@ -402,7 +431,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for an extra valve.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.SelectValveExtra))
+        return self._forge_static_packet(PumpCommand.SelectValveExtra)
 
     def forge_valve_6way_packet(self, valve_position: str) -> DTInstructionPacket:
         """
@@ -422,7 +451,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for reporting the device status.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.ReportStatus), execute=False)
+        return self._forge_static_packet(PumpCommand.ReportStatus, execute=False)
 
     def forge_report_plunger_position_packet(self) -> DTInstructionPacket:
         """
@@ -432,7 +461,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for reporting the device's plunger position.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.ReportPlungerPosition), execute=False)
+        return self._forge_static_packet(PumpCommand.ReportPlungerPosition, execute=False)
 
     def forge_report_start_velocity_packet(self) -> DTInstructionPacket:
         """
@@ -442,7 +471,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for reporting the device's starting velocity.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.ReportStartVelocity), execute=False)
+        return self._forge_static_packet(PumpCommand.ReportStartVelocity, execute=False)
 
     def forge_report_peak_velocity_packet(self) -> DTInstructionPacket:
         """
@@ -452,7 +481,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for reporting the device's peak velocity.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.ReportTopVelocity), execute=False)
+        return self._forge_static_packet(PumpCommand.ReportTopVelocity, execute=False)
 
     def forge_report_cutoff_velocity_packet(self) -> DTInstructionPacket:
         """
@@ -462,7 +491,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for reporting the device's cutoff velocity.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.ReportCutoffVelocity), execute=False)
+        return self._forge_static_packet(PumpCommand.ReportCutoffVelocity, execute=False)
 
     def forge_report_valve_position_packet(self) -> DTInstructionPacket:
         """
@@ -472,7 +501,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for reporting the device's valve position.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.ReportValvePosition), execute=False)
+        return self._forge_static_packet(PumpCommand.ReportValvePosition, execute=False)
 
     def forge_report_initialized_packet(self) -> DTInstructionPacket:
         """
@@ -482,7 +511,7 @@ class PumpProtocol:
             DTInstructionPacket: The packet created for reporting the initialisation of the device.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.ReportIsInitialized), execute=False)
+        return self._forge_static_packet(PumpCommand.ReportIsInitialized, execute=False)
 
     def forge_report_eeprom_packet(self) -> DTInstructionPacket:
         """
@@ -492,7 +521,7 @@ class PumpProtocol:
             The packet for reporting the EEPROM.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.ReportEEPROM), execute=False)
+        return self._forge_static_packet(PumpCommand.ReportEEPROM, execute=False)
 
     def forge_terminate_packet(self) -> DTInstructionPacket:
         """
@@ -502,4 +531,8 @@ class PumpProtocol:
             The packet for terminating any running command.
 
         """
-        return self.forge_packet(DTCommand(PumpCommand.Terminate), execute=False)
+        return self._forge_static_packet(PumpCommand.Terminate, execute=False)
+
+
+# every executed packet ends with the same command, so it is only created once
+_EXECUTE_CMD = DTCommand(PumpCommand.Execute)